@@ -24,11 +24,15 @@
 # SOFTWARE.
 from __future__ import annotations
 
-from .fb_gs4_hmsb import decorate_gs4_hmsb
-from .fb_mhlsb import decorate_mhlsb
-from .fb_mhmsb import decorate_mhmsb
-from .fb_mvlsb import decorate_mvlsb
+from array import array
+from bisect import insort
+
+from .fb_gs4_hmsb import FormatGs4Hmsb
+from .fb_mhlsb import FormatMhlsb
+from .fb_mhmsb import FormatMhmsb
+from .fb_mvlsb import FormatMvlsb
 from .font import font_petme128_8x8
+from .line import bresenham_points
 
 MVLSB = 0
 MONO_VLSB = 0
@@ -39,15 +43,28 @@ GS8 = 6
 MONO_HLSB = 3
 MONO_HMSB = 4
 
-_fb_format_decorator = {
-    GS4_HMSB: (decorate_gs4_hmsb, 1),
-    MONO_HLSB: (decorate_mhlsb, 7),
-    MONO_HMSB: (decorate_mhmsb, 7),
-    MVLSB: (decorate_mvlsb, 0),
-}
+
+def _cdiv(a: int, b: int) -> int:
+    # Integer division truncating toward zero as C does
+    q = abs(a) // abs(b)
+    return q if (a < 0) == (b < 0) else -q
 
 
 class FrameBuffer:
+    def __new__(
+        cls,
+        buf: bytearray,
+        width: int,
+        height: int,
+        fmt: int,
+        stride: int | None = None,
+    ) -> FrameBuffer:
+        # Frame buffer is always built as subclass implementing given pixel format
+        fb_class = _fb_format_class[fmt] if 0 <= fmt < len(_fb_format_class) else None
+        if fb_class is None:
+            raise ValueError("invalid format")
+        return object.__new__(fb_class)
+
     def __init__(
         self,
         buf: bytearray,
@@ -56,85 +73,53 @@ class FrameBuffer:
         fmt: int,
         stride: int | None = None,
     ) -> None:
-        decorate, align_factor = _fb_format_decorator[fmt]
-
         self.buf = buf
         self.width = width
         self.height = height
         self.format = fmt
         self.stride = (
-            (width if stride is None else stride) + align_factor
-        ) & ~align_factor
-
-        decorate(self)
+            (width if stride is None else stride) + self._stride_align
+        ) & ~self._stride_align
 
     def pixel(self, x: int, y: int, col: int = -1) -> int | None:
         if 0 <= x and x < self.width and 0 <= y and y < self.height:
             if col < 0:
-                return self._getpixel(self, x, y)
+                return self._getpixel(x, y)
             else:
-                self._setpixel(self, x, y, col)
+                self._setpixel(x, y, col)
                 return None
 
     def fill(self, col: int) -> None:
-        self._fill_rect(self, 0, 0, self.width, self.height, col)
+        self._fill_rect_checked(0, 0, self.width, self.height, col)
 
     def rect(
         self, x: int, y: int, width: int, height: int, col: int, fill: bool = False
     ) -> None:
         if fill:
-            self._fill_rect(self, x, y, width, height, col)
+            self._fill_rect_checked(x, y, width, height, col)
         else:
-            self._fill_rect(self, x, y, width, 1, col)
-            self._fill_rect(self, x, y + height - 1, width, 1, col)
-            self._fill_rect(self, x, y, 1, height, col)
-            self._fill_rect(self, x + width - 1, y, 1, height, col)
+            self._hline_checked(x, y, width, col)
+            self._hline_checked(x, y + height - 1, width, col)
+            self._vline_checked(x, y, height, col)
+            self._vline_checked(x + width - 1, y, height, col)
 
     def hline(self, x: int, y: int, w: int, col: int) -> None:
-        self._fill_rect(self, x, y, w, 1, col)
+        self._hline_checked(x, y, w, col)
 
     def vline(self, x: int, y: int, h: int, col: int) -> None:
-        self._fill_rect(self, self, x, y, 1, h, col)
+        self._vline_checked(x, y, h, col)
 
     def line(self, x1: int, y1: int, x2: int, y2: int, col: int) -> None:
-        dx = x2 - x1
-        if dx > 0:
-            sx = 1
-        else:
-            dx = -dx
-            sx = -1
-
-        dy = y2 - y1
-        if dy > 0:
-            sy = 1
-        else:
-            dy = -dy
-            sy = -1
-
-        steep = dy > dx
-        if steep:
-            x1, y1 = y1, x1
-            dx, dy = dy, dx
-            sx, sy = sy, sx
-
-        e = 2 * dy - dx
-        for _ in range(dx):
-            if steep:
-                if 0 <= y1 and y1 < self.width and 0 <= x1 and x1 < self.height:
-                    self._setpixel(self, y1, x1, col)
-            else:
-                if 0 <= x1 and x1 < self.width and 0 <= y1 and y1 < self.height:
-                    self._setpixel(self, x1, y1, col)
-
-            while e >= 0:
-                y1 += sy
-                e -= 2 * dx
-
-            x1 += sx
-            e += 2 * dy
+        # Axis aligned lines rasterize to the same pixels as spans
+        if y1 == y2:
+            self._hline_checked(min(x1, x2), y1, abs(x2 - x1) + 1, col)
+            return
+        if x1 == x2:
+            self._vline_checked(x1, min(y1, y2), abs(y2 - y1) + 1, col)
+            return
 
-        if 0 <= x2 and x2 < self.width and 0 <= y2 and y2 < self.height:
-            self._setpixel(self, x2, y2, col)
+        xs, ys = bresenham_points(x1, y1, x2, y2, self.width, self.height)
+        self._plot_points(xs, ys, col)
 
     def ellipse(
         self,
@@ -146,19 +131,22 @@ class FrameBuffer:
         fill: bool = False,
         msk: int = 0x0F,
     ) -> None:
-        mask = 0x0F if fill else 0
+        mask = 0x10 if fill else 0
         mask |= msk & 0x0F
-        two_asquare = 2 * xradius * xradius
-        two_bsquare = 2 * yradius * yradius
+        draw_ellipse_points = self._draw_ellipse_points
+        asquare = xradius * xradius
+        bsquare = yradius * yradius
+        two_asquare = 2 * asquare
+        two_bsquare = 2 * bsquare
         x = xradius
         y = 0
-        xchange = yradius * yradius * (1 - 2 * xradius)
-        ychange = xradius * xradius
+        xchange = bsquare * (1 - 2 * xradius)
+        ychange = asquare
         ellipse_error = 0
         stoppingx = two_bsquare * xradius
         stoppingy = 0
         while stoppingx >= stoppingy:
-            self._draw_ellipse_points(cx, cy, x, y, col, mask)
+            draw_ellipse_points(cx, cx - x, cx + x, cy - y, cy + y, col, mask)
             y += 1
             stoppingy += two_asquare
             ellipse_error += ychange
@@ -170,13 +158,13 @@ class FrameBuffer:
                 xchange += two_bsquare
         x = 0
         y = yradius
-        xchange = yradius * yradius
-        ychange = xradius * xradius * (1 - 2 * yradius)
+        xchange = bsquare
+        ychange = asquare * (1 - 2 * yradius)
         ellipse_error = 0
         stoppingx = 0
         stoppingy = two_asquare * yradius
         while stoppingx <= stoppingy:
-            self._draw_ellipse_points(cx, cy, x, y, col, mask)
+            draw_ellipse_points(cx, cx - x, cx + x, cy - y, cy + y, col, mask)
             x += 1
             stoppingx += two_bsquare
             ellipse_error += xchange
@@ -188,20 +176,30 @@ class FrameBuffer:
                 ychange += two_asquare
 
     def text(self, txt: str, x: int, y: int, col: int = 1) -> None:
+        # Glyph columns are 8 pixels high, so vertical clipping is the same
+        # for all of them and can be evaluated just once
+        if y <= -8 or y >= self.height:
+            return
+        skip = max(0, -y)
+        y += skip
+        visible = (1 << min(8 - skip, self.height - y)) - 1
+
+        font = font_petme128_8x8
+        width = self.width
+        draw_glyph_column = self._draw_glyph_column
+
         for cc in txt:
             c = ord(cc)
             if c < 32 or c > 127:
                 c = 127
             o = (c - 32) * 8
-            chr_data = font_petme128_8x8[o : o + 8]
-            for vline_data in chr_data:
-                if 0 <= x and x < self.width:
-                    yy = y
-                    while vline_data:
-                        if vline_data & 1 and 0 <= y and y < self.height:
-                            self._setpixel(self, x, yy, col)
-                        vline_data >>= 1
-                        yy += 1
+
+            # Glyph columns are read directly from font, without slicing it
+            for o in range(o, o + 8):
+                if 0 <= x and x < width:
+                    vline_data = (font[o] >> skip) & visible
+                    if vline_data:
+                        draw_glyph_column(x, y, vline_data, col)
                 x += 1
 
     def blit(
@@ -212,66 +210,100 @@ class FrameBuffer:
         key: int = -1,
         palette: FrameBuffer | None = None,
     ) -> None:
-        if (
-            x >= self.width
-            or y >= self.height
-            or -x >= source.width
-            or -y >= source.height
-        ):
+        width = self.width
+        height = self.height
+        src_width = source.width
+        src_height = source.height
+
+        if x >= width or y >= height or -x >= src_width or -y >= src_height:
             return
         x0 = max(0, x)
         y0 = max(0, y)
         x1 = max(0, -x)
         y1 = max(0, -y)
-        x0end = min(self.width, x + source.width)
-        y0end = min(self.height, y + source.height)
-        while y0 < y0end:
-            cx1 = x1
-            for cx0 in range(x0, x0end):
-                col = source._getpixel(source, cx1, y1)
-                if palette:
-                    col = palette._getpixel(palette, col, 0)
-                if col != key:
-                    self._setpixel(self, cx0, y0, col)
-                cx1 += 1
+        x0end = min(width, x + src_width)
+        y0end = min(height, y + src_height)
+
+        ppb = self._pixels_per_byte
+        if (
+            ppb
+            and key == -1
+            and palette is None
+            and type(source) is type(self)
+            and not (x0 - x1) % ppb
+        ):
+            # Rows of the same format and the same pixel alignment in byte
+            # are copied as byte slices, only partial bytes at edges go by pixels
+            self._blit_bytes(source, x0, y0, x1, y1, x0end - x0, y0end - y0)
+            return
+
+        # Palette lookup and key test of every source color are evaluated once,
+        # colors matching key are marked with None
+        if palette is None:
+            lut = [None if c == key else c for c in range(16)]
+        else:
+            # Palette is read beyond its width the same way as modframebuf.c does,
+            # only colors out of palette buffer are left out of table
+            lut = []
+            for c in range(16):
+                try:
+                    c = palette._getpixel(c, 0)
+                except IndexError:
+                    break
+                lut.append(None if c == key else c)
+
+        # Rows are transferred as spans, so row offsets are evaluated once per row
+        get_span = source._get_span
+        set_span = self._set_span
+        w = x0end - x0
+        for y0 in range(y0, y0end):
+            set_span(x0, y0, [lut[c] for c in get_span(x1, y1, w)])
             y1 += 1
-            y0 += 1
 
     def scroll(self, xstep: int, ystep: int) -> None:
-        if xstep < 0:
-            sx = 0
-            xend = self.width + xstep
-            if xend <= 0:
-                return
-            dx = 1
-        else:
-            sx = self.width - 1
-            xend = xstep - 1
-            if xend >= sx:
-                return
-            dx = -1
+        if abs(xstep) >= self.width or abs(ystep) >= self.height:
+            return
+
+        ppb = self._pixels_per_byte
+        if ppb and not xstep and self.stride == self.width:
+            # Rows are contiguous in buffer and hold no pixels out of view, so
+            # vertical scroll moves all of them by single slice assignment
+            buf = self.buf
+            o = abs(ystep) * (self.stride // ppb)
+            n = (self.height * self.stride) // ppb - o
+            if ystep < 0:
+                buf[:n] = buf[o : o + n]
+            else:
+                buf[o : o + n] = buf[:n]
+            return
+
+        # Each row is read as whole before it is written, which is the same as
+        # copying pixels in direction of scroll
+        x = max(0, xstep)
+        w = self.width - abs(xstep)
+        get_span = self._get_span
+        set_span = self._set_span
         if ystep < 0:
-            y = 0
-            yend = self.height + ystep
-            if yend <= 0:
-                return
-            dy = 1
+            rows = range(0, self.height + ystep)
         else:
-            y = self.height - 1
-            yend = ystep - 1
-            if yend >= y:
-                return
-            dy = -1
-        while y != yend:
-            for x in range(sx, xend, dx):
-                self._setpixel(self, x, y, self._getpixel(self, x - xstep, y - ystep))
-            y += dy
+            rows = range(self.height - 1, ystep - 1, -1)
+
+        for y in rows:
+            set_span(x, y, get_span(x - xstep, y - ystep, w))
 
     def poly(self, x: int, y: int, coords: list, col: int, fill: bool = False) -> None:
-        n_poly = len(coords) // 2
-        bufinfo = coords[: n_poly * 2]
+        # Interleaved x, y coordinates are split to separate coordinate arrays
+        n = len(coords) & ~1
+        self.poly_soa(
+            x, y, array("h", coords[0:n:2]), array("h", coords[1:n:2]), col, fill
+        )
+
+    def poly_soa(
+        self, x: int, y: int, xs: array, ys: array, col: int, fill: bool = False
+    ) -> None:
+        n_poly = len(xs)
 
-        if not bufinfo:
+        if not n_poly:
             return
 
         if fill:
@@ -281,22 +313,21 @@ class FrameBuffer:
             # coordinates where the scan line intersects the polygon edges,
             # then fill between each resulting pair.
 
+            # Each node is the x coordinate where an edge crosses the scan line,
+            # nodes are kept sorted left-to-right as they are inserted.
+            nodes = array("i")
+            setpixel_checked = self._setpixel_checked
+            hline_checked = self._hline_checked
+            line = self.line
+
             # Restrict just to the scan lines that include the vertical extent of
             # this polygon.
-            y_min = min(bufinfo[1::2])
-            y_max = max(bufinfo[1::2])
-
-            for row in range(y_min, y_max):
-                # Each node is the x coordinate where an edge crosses this scan line.
-                nodes = list()
-                px1 = bufinfo[0]
-                py1 = bufinfo[1]
-                i = n_poly * 2 - 1
-                while True:
-                    py2 = bufinfo[i]
-                    i -= 1
-                    px2 = bufinfo[i]
-                    i -= 1
+            for row in range(min(ys), max(ys) + 1):
+                px1 = xs[0]
+                py1 = ys[0]
+                for i in range(n_poly - 1, -1, -1):
+                    px2 = xs[i]
+                    py2 = ys[i]
 
                     # Don't include the bottom pixel of a given edge to avoid
                     # duplicating the node with the start of the next edge. This
@@ -305,81 +336,162 @@ class FrameBuffer:
                     if py1 != py2 and (
                         (py1 > row and py2 <= row) or (py1 <= row and py2 > row)
                     ):
-                        node = (
-                            32 * px1 + 32 * (px2 - px1) * (row - py1) / (py2 - py1) + 16
-                        ) / 32
-                        nodes.append(node)
+                        node = _cdiv(
+                            32 * px1
+                            + _cdiv(32 * (px2 - px1) * (row - py1), py2 - py1)
+                            + 16,
+                            32,
+                        )
+                        insort(nodes, node)
                     elif row == max(py1, py2):
                         # At local-minima, try and manually fill in the pixels that get missed above.
                         if py1 < py2:
-                            self._setpixel_checked(x + px2, y + py2, col, 1)
+                            setpixel_checked(x + px2, y + py2, col, 1)
                         elif py2 < py1:
-                            self._setpixel_checked(x + px1, y + py1, col, 1)
+                            setpixel_checked(x + px1, y + py1, col, 1)
                         else:
                             # Even though this is a hline and would be faster to
                             # use fill_rect, use line() because it handles x2 <
                             # x1.
-                            self.line(x + px1, y + py1, x + px2, y + py2, col)
+                            line(x + px1, y + py1, x + px2, y + py2, col)
 
                     px1 = px2
                     py1 = py2
 
-                    if i < 0:
-                        break
-
                 if not nodes:
                     continue
 
-                # Sort the nodes left-to-right (bubble-sort for code size).
-                nodes.sort()
-
                 # Fill between each pair of nodes.
                 for i in range(0, len(nodes), 2):
-                    self._fill_rect(
-                        self,
-                        x + nodes[i],
-                        y + row,
-                        (nodes[i + 1] - nodes[i]) + 1,
-                        1,
-                        col,
+                    hline_checked(
+                        x + nodes[i], y + row, (nodes[i + 1] - nodes[i]) + 1, col
                     )
+
+                del nodes[:]
         else:
             # Outline only.
-            px1 = bufinfo[0]
-            py1 = bufinfo[1]
-            i = n_poly * 2 - 1
-            while True:
-                py2 = bufinfo[i]
-                i -= 1
-                px2 = bufinfo[i]
-                i -= 1
-                self.line(x + px1, y + py1, x + px2, y + py2, col)
+            line = self.line
+            px1 = xs[0]
+            py1 = ys[0]
+            for i in range(n_poly - 1, -1, -1):
+                px2 = xs[i]
+                py2 = ys[i]
+                line(x + px1, y + py1, x + px2, y + py2, col)
                 px1 = px2
                 py1 = py2
-                if i < 0:
-                    break
 
     def _draw_ellipse_points(
-        self, cx: int, cy: int, x: int, y: int, col: int, mask: int
+        self, cx: int, xl: int, xr: int, yt: int, yb: int, col: int, mask: int
     ) -> None:
-        if mask & 0x0F:
+        if mask & 0x10:
+            w = xr - cx + 1
             if mask & 0x01:
-                self._fill_rect(self, cx, cy - y, x + 1, 1, col)
+                self._hline_checked(cx, yt, w, col)
             if mask & 0x02:
-                self._fill_rect(self, cx - x, cy - y, x + 1, 1, col)
+                self._hline_checked(xl, yt, w, col)
             if mask & 0x04:
-                self._fill_rect(self, cx - x, cy + y, x + 1, 1, col)
+                self._hline_checked(xl, yb, w, col)
             if mask & 0x08:
-                self._fill_rect(self, cx, cy + y, x + 1, 1, col)
+                self._hline_checked(cx, yb, w, col)
         else:
-            self._setpixel_checked(cx + x, cy - y, col, mask & 0x01)
-            self._setpixel_checked(cx - x, cy - y, col, mask & 0x02)
-            self._setpixel_checked(cx - x, cy + y, col, mask & 0x04)
-            self._setpixel_checked(cx + x, cy + y, col, mask & 0x08)
+            self._setpixel_checked(xr, yt, col, mask & 0x01)
+            self._setpixel_checked(xl, yt, col, mask & 0x02)
+            self._setpixel_checked(xl, yb, col, mask & 0x04)
+            self._setpixel_checked(xr, yb, col, mask & 0x08)
+
+    def _fill_rect_checked(self, x: int, y: int, w: int, h: int, col: int) -> None:
+        width = self.width
+        height = self.height
+
+        if h < 1 or w < 1 or x + w <= 0 or y + h <= 0 or y >= height or x >= width:
+            return
+
+        xend = min(width, x + w)
+        yend = min(height, y + h)
+        x = max(x, 0)
+        y = max(y, 0)
+        self._fill_rect(x, y, xend - x, yend - y, col)
+
+    def _hline_checked(self, x: int, y: int, w: int, col: int) -> None:
+        width = self.width
+
+        if w < 1 or x + w <= 0 or y < 0 or y >= self.height or x >= width:
+            return
+
+        xend = min(width, x + w)
+        x = max(x, 0)
+        self._hline(x, y, xend - x, col)
+
+    def _vline_checked(self, x: int, y: int, h: int, col: int) -> None:
+        height = self.height
+
+        if h < 1 or y + h <= 0 or x < 0 or x >= self.width or y >= height:
+            return
+
+        yend = min(height, y + h)
+        y = max(y, 0)
+        self._vline(x, y, yend - y, col)
+
+    def _blit_bytes(
+        self, source: FrameBuffer, x0: int, y0: int, x1: int, y1: int, w: int, h: int
+    ) -> None:
+        # Both frame buffers have the same format and pixels of source and
+        # destination lines share the same position within byte
+        ppb = self._pixels_per_byte
+        head = min(w, -x0 % ppb)
+        n = (w - head) // ppb
+        tail = w - head - n * ppb
+        get_span = source._get_span
+        set_span = self._set_span
+        buf = self.buf
+        src = memoryview(source.buf)
+        o0 = (x0 + head + y0 * self.stride) // ppb
+        o1 = (x1 + head + y1 * source.stride) // ppb
+        advance0 = self.stride // ppb
+        advance1 = source.stride // ppb
+
+        for _ in range(h):
+            if head:
+                set_span(x0, y0, get_span(x1, y1, head))
+            buf[o0 : o0 + n] = src[o1 : o1 + n]
+            if tail:
+                set_span(x0 + w - tail, y0, get_span(x1 + w - tail, y1, tail))
+            o0 += advance0
+            o1 += advance1
+            y0 += 1
+            y1 += 1
 
     def _setpixel_checked(self, x: int, y: int, col: int, mask: int) -> None:
         if mask and 0 <= x and x < self.width and 0 <= y and y < self.height:
-            self._setpixel(self, x, y, col)
+            self._setpixel(x, y, col)
+
+
+class _FrameBufferGs4Hmsb(FormatGs4Hmsb, FrameBuffer):
+    ...
+
+
+class _FrameBufferMhlsb(FormatMhlsb, FrameBuffer):
+    ...
+
+
+class _FrameBufferMhmsb(FormatMhmsb, FrameBuffer):
+    ...
+
+
+class _FrameBufferMvlsb(FormatMvlsb, FrameBuffer):
+    ...
+
+
+# Indexed by format, formats which are not implemented are None
+_fb_format_class = (
+    _FrameBufferMvlsb,  # MVLSB
+    None,  # RGB565
+    _FrameBufferGs4Hmsb,  # GS4_HMSB
+    _FrameBufferMhlsb,  # MONO_HLSB
+    _FrameBufferMhmsb,  # MONO_HMSB
+    None,  # GS2_HMSB
+    None,  # GS8
+)
 
 
 __all__ = (
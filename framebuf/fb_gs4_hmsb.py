@@ -25,56 +25,145 @@
 from __future__ import annotations
 
 
-def decorate_gs4_hmsb(fb: "FrameBuffer") -> None:
-    fb._getpixel = _getpixel
-    fb._setpixel = _setpixel
-    fb._fill_rect = _fill_rect
-
-
-def _setpixel(fb: "FrameBuffer", x: int, y: int, col: int) -> None:
-    col &= 0x0F
-    o = (x + y * fb.stride) >> 1
-
-    if x % 2:
-        fb.buf[o] = (col & 0x0F) | (fb.buf[o] & 0xF0)
-    else:
-        fb.buf[o] = (col << 4) | (fb.buf[o] & 0x0F)
-
-
-def _getpixel(fb: "FrameBuffer", x: int, y: int) -> int:
-    if x % 2:
-        return fb.buf[(x + y * fb.stride) >> 1] & 0x0F
-    else:
-        return fb.buf[(x + y * fb.stride) >> 1] >> 4
-
-
-def _fill_rect(fb: "FrameBuffer", x: int, y: int, w: int, h: int, col: int) -> None:
-    col &= 0x0F
-    # uint8_t *pixel_pair = &((uint8_t *)fb->buf)[(x + y * fb->stride) >> 1];
-    o = (x + y * fb.stride) >> 1
-    col_shifted_left = col << 4
-    col_pixel_pair = col_shifted_left | col
-    pixel_count_till_next_line = (fb.stride - w) >> 1
-    odd_x = x % 2
-
-    for _ in range(h):
-        ww = w
-
-        if odd_x and ww > 0:
-            fb.buf[o] = (fb.buf[o] & 0xF0) | col
-            o += 1
-            ww += 1
-
-        # memset(pixel_pair, col_pixel_pair, ww >> 1)
-        fb.buf[o : o + col_pixel_pair] = [(ww >> 1) & 255] * col_pixel_pair
-        o += ww >> 1
-
-        if ww % 2:
-            fb.buf[o] = col_shifted_left | (fb.buf[o] & 0x0F)
-            if not odd_x:
-                o += 1
-
-        o += pixel_count_till_next_line
-
-
-__all__ = ("decorate_gs4_hmsb",)
+# Pixel values of even (high nibble) and odd (low nibble) pixel of pixel pair
+_HI = bytes(b >> 4 for b in range(256))
+_LO = bytes(b & 0x0F for b in range(256))
+
+# Pixel pair with even pixel set to given color
+_SET_HI = bytes(c << 4 for c in range(16))
+
+# Rows of pixel pairs of each color, shared by all fills and grown on demand
+_pairs_lines = [memoryview(b"")] * 16
+
+
+class FormatGs4Hmsb:
+    _stride_align = 1
+    _pixels_per_byte = 2
+
+    def fill(self, col: int) -> None:
+        if self.stride != self.width:
+            # Row padding may be pixels of another frame buffer view
+            self._fill_rect(0, 0, self.width, self.height, col)
+            return
+
+        col &= 0x0F
+        n = (self.stride * self.height) >> 1
+        self.buf[:n] = bytes(((col << 4) | col,)) * n
+
+    def _setpixel(self, x: int, y: int, col: int) -> None:
+        buf = self.buf
+        o = (x + y * self.stride) >> 1
+
+        if x & 1:
+            buf[o] = (col & 0x0F) | (buf[o] & 0xF0)
+        else:
+            buf[o] = _SET_HI[col & 0x0F] | _LO[buf[o]]
+
+    def _getpixel(self, x: int, y: int) -> int:
+        return (_LO if x & 1 else _HI)[self.buf[(x + y * self.stride) >> 1]]
+
+    def _get_span(self, x: int, y: int, w: int) -> list:
+        buf = self.buf
+        row = y * self.stride
+        return [(_LO if x & 1 else _HI)[buf[(x + row) >> 1]] for x in range(x, x + w)]
+
+    def _set_span(self, x: int, y: int, cols: list) -> None:
+        # Pixels with color None are skipped
+        buf = self.buf
+        row = y * self.stride
+
+        for x, col in enumerate(cols, x):
+            if col is not None:
+                o = (x + row) >> 1
+                if x & 1:
+                    buf[o] = (col & 0x0F) | (buf[o] & 0xF0)
+                else:
+                    buf[o] = _SET_HI[col & 0x0F] | _LO[buf[o]]
+
+    def _fill_rect(self, x: int, y: int, w: int, h: int, col: int) -> None:
+        # Rectangle is expected to be already clipped to frame buffer
+        col &= 0x0F
+        buf = self.buf
+        advance = self.stride >> 1
+        o = (x + y * self.stride) >> 1
+        col_shifted_left = col << 4
+        odd_x = x & 1
+        pairs = (w - odd_x) >> 1
+        odd_w = (w - odd_x) & 1
+
+        pairs_line = _pairs_lines[col]
+        if len(pairs_line) < pairs:
+            pairs_line = memoryview(bytes((col_shifted_left | col,)) * pairs)
+            _pairs_lines[col] = pairs_line
+        pairs_line = pairs_line[:pairs]
+
+        for _ in range(h):
+            i = o
+
+            if odd_x:
+                buf[i] = (buf[i] & 0xF0) | col
+                i += 1
+
+            # memset(pixel_pair, col_pixel_pair, ww >> 1)
+            buf[i : i + pairs] = pairs_line
+            i += pairs
+
+            if odd_w:
+                buf[i] = col_shifted_left | (buf[i] & 0x0F)
+
+            o += advance
+
+    def _hline(self, x: int, y: int, w: int, col: int) -> None:
+        # Line is expected to be already clipped to frame buffer
+        self._fill_rect(x, y, w, 1, col)
+
+    def _vline(self, x: int, y: int, h: int, col: int) -> None:
+        # Line is expected to be already clipped to frame buffer
+        col &= 0x0F
+        buf = self.buf
+        advance = self.stride >> 1
+        o = (x + y * self.stride) >> 1
+
+        if x & 1:
+            keep = 0xF0
+        else:
+            keep = 0x0F
+            col <<= 4
+
+        for o in range(o, o + h * advance, advance):
+            buf[o] = col | (buf[o] & keep)
+
+    def _plot_points(self, xs: list, ys: list, col: int) -> None:
+        col &= 0x0F
+        buf = self.buf
+        stride = self.stride
+        col_shifted_left = col << 4
+
+        for x, y in zip(xs, ys):
+            o = (x + y * stride) >> 1
+            if x & 1:
+                buf[o] = col | (buf[o] & 0xF0)
+            else:
+                buf[o] = col_shifted_left | (buf[o] & 0x0F)
+
+    def _draw_glyph_column(self, x: int, y: int, bits: int, col: int) -> None:
+        # Column bits (LSB at top) are expected to be already clipped to frame buffer
+        col &= 0x0F
+        buf = self.buf
+        advance = self.stride >> 1
+        o = (x + y * self.stride) >> 1
+
+        if x & 1:
+            keep = 0xF0
+        else:
+            keep = 0x0F
+            col <<= 4
+
+        while bits:
+            if bits & 1:
+                buf[o] = col | (buf[o] & keep)
+            bits >>= 1
+            o += advance
+
+
+__all__ = ("FormatGs4Hmsb",)
@@ -25,33 +25,150 @@
 from __future__ import annotations
 
 
-def decorate_mhmsb(fb: "FrameBuffer") -> None:
-    fb._getpixel = _getpixel
-    fb._setpixel = _setpixel
-    fb._fill_rect = _fill_rect
+class FormatMhmsb:
+    _stride_align = 7
+    _pixels_per_byte = 8
 
+    def fill(self, col: int) -> None:
+        if self.stride != self.width:
+            # Row padding may be pixels of another frame buffer view
+            self._fill_rect(0, 0, self.width, self.height, col)
+            return
 
-def _setpixel(fb: "FrameBuffer", x: int, y: int, col: int) -> None:
-    index = (x + y * fb.stride) >> 3
-    offset = x & 0x07
-    fb.buf[index] = (fb.buf[index] & ~(0x01 << offset)) | ((col != 0) << offset)
+        n = (self.stride >> 3) * self.height
+        self.buf[:n] = (b"\xFF" if col else b"\x00") * n
 
+    def _setpixel(self, x: int, y: int, col: int) -> None:
+        buf = self.buf
+        index = (x + y * self.stride) >> 3
+        offset = x & 0x07
+        buf[index] = (buf[index] & ~(0x01 << offset)) | ((col != 0) << offset)
+
+    def _getpixel(self, x: int, y: int) -> int:
+        index = (x + y * self.stride) >> 3
+        offset = x & 0x07
+        return (self.buf[index] >> (offset)) & 0x01
 
-def _getpixel(fb: "FrameBuffer", x: int, y: int) -> int:
-    index = (x + y * fb.stride) >> 3
-    offset = x & 0x07
-    return (fb.buf[index] >> (offset)) & 0x01
+    def _get_span(self, x: int, y: int, w: int) -> list:
+        buf = self.buf
+        row = y * self.stride
+        return [(buf[(x + row) >> 3] >> (x & 0x07)) & 0x01 for x in range(x, x + w)]
 
+    def _set_span(self, x: int, y: int, cols: list) -> None:
+        # Pixels with color None are skipped
+        buf = self.buf
+        row = y * self.stride
 
-def _fill_rect(fb: "FrameBuffer", x: int, y: int, w: int, h: int, col: int) -> None:
-    advance = fb.stride >> 3
-    for _ in range(w):
+        for x, col in enumerate(cols, x):
+            if col is not None:
+                index = (x + row) >> 3
+                offset = x & 0x07
+                buf[index] = (buf[index] & ~(0x01 << offset)) | ((col != 0) << offset)
+
+    def _fill_rect(self, x: int, y: int, w: int, h: int, col: int) -> None:
+        # Rectangle is expected to be already clipped to frame buffer
+        buf = self.buf
+        advance = self.stride >> 3
         o = (x >> 3) + y * advance
-        offset = x & 0x07
+        xend = x + w - 1
+        n = (xend >> 3) - (x >> 3)
+        left_mask = (0xFF << (x & 0x07)) & 0xFF
+        right_mask = 0xFF >> (7 - (xend & 0x07))
+
+        if n == 0:
+            # Whole span fits into single byte
+            left_mask &= right_mask
+
+        middle = (b"\xFF" if col else b"\x00") * (n - 1)
+
         for _ in range(h):
-            fb.buf[o] = (fb.buf[o] & ~(0x01 << offset)) | ((col != 0) << offset)
-            b += advance
-        x += 1
+            if col:
+                buf[o] |= left_mask
+            else:
+                buf[o] &= ~left_mask
+
+            if n:
+                buf[o + 1 : o + n] = middle
+                if col:
+                    buf[o + n] |= right_mask
+                else:
+                    buf[o + n] &= ~right_mask
+
+            o += advance
+
+    def _hline(self, x: int, y: int, w: int, col: int) -> None:
+        # Line is expected to be already clipped to frame buffer
+        buf = self.buf
+        o = (x + y * self.stride) >> 3
+        xend = x + w - 1
+        n = (xend >> 3) - (x >> 3)
+        left_mask = (0xFF << (x & 0x07)) & 0xFF
+        right_mask = 0xFF >> (7 - (xend & 0x07))
+
+        if n == 0:
+            # Whole line fits into single byte
+            left_mask &= right_mask
+        else:
+            buf[o + 1 : o + n] = (b"\xFF" if col else b"\x00") * (n - 1)
+            if col:
+                buf[o + n] |= right_mask
+            else:
+                buf[o + n] &= ~right_mask
+
+        if col:
+            buf[o] |= left_mask
+        else:
+            buf[o] &= ~left_mask
+
+    def _vline(self, x: int, y: int, h: int, col: int) -> None:
+        # Line is expected to be already clipped to frame buffer
+        buf = self.buf
+        advance = self.stride >> 3
+        o = (x + y * self.stride) >> 3
+        mask = 0x01 << (x & 0x07)
+
+        if col:
+            for o in range(o, o + h * advance, advance):
+                buf[o] |= mask
+        else:
+            mask = ~mask
+            for o in range(o, o + h * advance, advance):
+                buf[o] &= mask
+
+    def _plot_points(self, xs: list, ys: list, col: int) -> None:
+        # Neighboring points sharing the same byte are merged to single write
+        buf = self.buf
+        stride = self.stride
+        index = -1
+        bits = 0
+
+        for x, y in zip(xs, ys):
+            i = (x + y * stride) >> 3
+            if i != index:
+                if bits:
+                    buf[index] = (buf[index] | bits) if col else (buf[index] & ~bits)
+                index = i
+                bits = 0
+            bits |= 0x01 << (x & 0x07)
+
+        if bits:
+            buf[index] = (buf[index] | bits) if col else (buf[index] & ~bits)
+
+    def _draw_glyph_column(self, x: int, y: int, bits: int, col: int) -> None:
+        # Column bits (LSB at top) are expected to be already clipped to frame buffer
+        buf = self.buf
+        advance = self.stride >> 3
+        o = (x + y * self.stride) >> 3
+        mask = 0x01 << (x & 0x07)
+
+        while bits:
+            if bits & 1:
+                if col:
+                    buf[o] |= mask
+                else:
+                    buf[o] &= ~mask
+            bits >>= 1
+            o += advance
 
 
-__all__ = ("decorate_mhmsb",)
+__all__ = ("FormatMhmsb",)
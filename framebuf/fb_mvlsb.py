@@ -25,32 +25,173 @@
 from __future__ import annotations
 
 
-def decorate_mvlsb(fb: "FrameBuffer") -> None:
-    fb._getpixel = _getpixel
-    fb._setpixel = _setpixel
-    fb._fill_rect = _fill_rect
+class FormatMvlsb:
+    _stride_align = 0
+    _pixels_per_byte = 0
 
+    def fill(self, col: int) -> None:
+        if self.stride != self.width or self.height & 0x07:
+            # Columns out of view and rows below its last band may be pixels
+            # of another frame buffer view
+            self._fill_rect(0, 0, self.width, self.height, col)
+            return
 
-def _setpixel(fb: "FrameBuffer", x: int, y: int, col: int) -> None:
-    index = (y >> 3) * fb.stride
-    offset = y & 0x07
-    self.buf[index] = (self.buf[index] & (~(0x01 << offset))) | (
-        int(col != 0) << offset
-    )
+        n = ((self.height + 7) >> 3) * self.stride
+        self.buf[:n] = (b"\xFF" if col else b"\x00") * n
+
+    def scroll(self, xstep: int, ystep: int) -> None:
+        width = self.width
+        height = self.height
+        stride = self.stride
+        buf = self.buf
+
+        if not ystep and -width < xstep < width:
+            # Columns of each band are contiguous in buffer
+            bands = height >> 3
+            if xstep < 0:
+                src, dst, n = -xstep, 0, width + xstep
+            else:
+                src, dst, n = 0, xstep, width - xstep
+
+            for o in range(0, bands * stride, stride):
+                buf[o + dst : o + dst + n] = buf[o + src : o + src + n]
+
+            if height & 0x07:
+                # Rows of last band below frame buffer are kept
+                o = bands * stride
+                _merge_band(buf, o + dst, buf[o + src : o + src + n], height)
+        elif (
+            not xstep
+            and not ystep & 0x07
+            and -height < ystep < height
+            and stride == width
+        ):
+            # Whole bands are moved by single slice assignment
+            o = (abs(ystep) >> 3) * stride
+            n = ((height + 7) >> 3) * stride - o
+            if ystep > 0:
+                src, dst = 0, o
+            else:
+                src, dst = o, 0
+
+            if height & 0x07:
+                # Band written from (or into) last band is merged, so rows below
+                # frame buffer are neither scrolled in nor overwritten
+                n -= stride
+                last = buf[src + n : src + n + width]
+                buf[dst : dst + n] = buf[src : src + n]
+                _merge_band(buf, dst + n, last, height)
+            else:
+                buf[dst : dst + n] = buf[src : src + n]
+        else:
+            super().scroll(xstep, ystep)
 
+    def _setpixel(self, x: int, y: int, col: int) -> None:
+        buf = self.buf
+        index = (y >> 3) * self.stride + x
+        offset = y & 0x07
+        buf[index] = (buf[index] & ~(0x01 << offset)) | ((col != 0) << offset)
 
-def _getpixel(fb: "FrameBuffer", x: int, y: int) -> int:
-    return (fb.buf[(y >> 3) * fb.stride + x] >> (y & 0x07)) & 0x01
+    def _getpixel(self, x: int, y: int) -> int:
+        return (self.buf[(y >> 3) * self.stride + x] >> (y & 0x07)) & 0x01
 
+    def _get_span(self, x: int, y: int, w: int) -> list:
+        buf = self.buf
+        row = (y >> 3) * self.stride
+        offset = y & 0x07
+        return [(buf[row + x] >> offset) & 0x01 for x in range(x, x + w)]
 
-def _fill_rect(fb: "FrameBuffer", x: int, y: int, w: int, h: int, col: int) -> None:
-    for _ in range(h):
-        o = (y >> 3) * fb.stride + x
+    def _set_span(self, x: int, y: int, cols: list) -> None:
+        # Pixels with color None are skipped
+        buf = self.buf
+        row = (y >> 3) * self.stride
         offset = y & 0x07
-        for _ in range(w):
-            fb.buf[o] = (fb.buf[o] & ~(0x01 << offset)) | ((col != 0) << offset)
-            o += 1
-        ++y
+        mask = ~(0x01 << offset)
+
+        for x, col in enumerate(cols, row + x):
+            if col is not None:
+                buf[x] = (buf[x] & mask) | ((col != 0) << offset)
+
+    def _fill_rect(self, x: int, y: int, w: int, h: int, col: int) -> None:
+        # Rectangle is expected to be already clipped to frame buffer. It is filled
+        # by horizontal bands 8 pixels high, so each byte of band is written once.
+        buf = self.buf
+        stride = self.stride
+        yend = y + h - 1
+        full = (b"\xFF" if col else b"\x00") * w
+
+        for band in range(y >> 3, (yend >> 3) + 1):
+            o = band * stride + x
+            top = max(y, band << 3) & 0x07
+            bottom = min(yend, (band << 3) + 7) & 0x07
+            mask = (0xFF >> (7 - bottom)) & (0xFF << top)
+
+            if mask == 0xFF:
+                buf[o : o + w] = full
+            elif col:
+                buf[o : o + w] = bytes([b | mask for b in buf[o : o + w]])
+            else:
+                mask = ~mask
+                buf[o : o + w] = bytes([b & mask for b in buf[o : o + w]])
+
+    def _hline(self, x: int, y: int, w: int, col: int) -> None:
+        # Line is expected to be already clipped to frame buffer
+        buf = self.buf
+        o = (y >> 3) * self.stride + x
+        mask = 0x01 << (y & 0x07)
+
+        if col:
+            buf[o : o + w] = bytes([b | mask for b in buf[o : o + w]])
+        else:
+            mask = ~mask
+            buf[o : o + w] = bytes([b & mask for b in buf[o : o + w]])
+
+    def _vline(self, x: int, y: int, h: int, col: int) -> None:
+        # Line is expected to be already clipped to frame buffer. Line is 1 pixel
+        # wide, so each band is covered by single byte.
+        self._fill_rect(x, y, 1, h, col)
+
+    def _plot_points(self, xs: list, ys: list, col: int) -> None:
+        # Neighboring points sharing the same byte are merged to single write
+        buf = self.buf
+        stride = self.stride
+        index = -1
+        bits = 0
+
+        for x, y in zip(xs, ys):
+            i = (y >> 3) * stride + x
+            if i != index:
+                if bits:
+                    buf[index] = (buf[index] | bits) if col else (buf[index] & ~bits)
+                index = i
+                bits = 0
+            bits |= 0x01 << (y & 0x07)
+
+        if bits:
+            buf[index] = (buf[index] | bits) if col else (buf[index] & ~bits)
+
+    def _draw_glyph_column(self, x: int, y: int, bits: int, col: int) -> None:
+        # Column bits (LSB at top) are expected to be already clipped to frame buffer.
+        # Glyph column spans at most two bytes of two neighboring bands.
+        buf = self.buf
+        o = (y >> 3) * self.stride + x
+        bits <<= y & 0x07
+
+        for mask in (bits & 0xFF, bits >> 8):
+            if mask:
+                if col:
+                    buf[o] |= mask
+                else:
+                    buf[o] &= ~mask
+            o += self.stride
+
+
+def _merge_band(buf: bytearray, o: int, src: bytes, height: int) -> None:
+    # Writes rows of the last (partial) band of frame buffer from src to buf at o
+    mask = (1 << (height & 0x07)) - 1
+    buf[o : o + len(src)] = bytes(
+        [(s & mask) | (d & ~mask) for s, d in zip(src, buf[o : o + len(src)])]
+    )
 
 
-__all__ = ("decorate_mvlsb",)
+__all__ = ("FormatMvlsb",)
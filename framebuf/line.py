@@ -0,0 +1,124 @@
+# MicroPython EInk displays drivers - python variant of frame buffer
+#
+# Based on modframebuf.c
+#
+# MIT License
+# Copyright (c) 2023 Ondrej Sienczak
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+from __future__ import annotations
+
+
+def bresenham_points(
+    x1: int, y1: int, x2: int, y2: int, width: int, height: int
+) -> tuple:
+    """Rasterize line to coordinates of pixels visible in frame buffer
+
+    Pixels are the same as produced by Bresenham's algorithm, however the
+    step `i` along major axis is evaluated in closed form
+    `(x1 + sx * i, y1 + sy * ((2 * dy * i + dx) // (2 * dx)))`, so all
+    coordinates are produced at once without error term iteration.
+
+    :return:    Pair of lists with X and Y coordinates of line pixels
+    """
+    dx = x2 - x1
+    if dx > 0:
+        sx = 1
+    else:
+        dx = -dx
+        sx = -1
+
+    dy = y2 - y1
+    if dy > 0:
+        sy = 1
+    else:
+        dy = -dy
+        sy = -1
+
+    steep = dy > dx
+    if steep:
+        x1, y1 = y1, x1
+        dx, dy = dy, dx
+        sx, sy = sy, sx
+        width, height = height, width
+
+    steps = _clip_line(x1, y1, dx, dy, sx, sy, width, height)
+
+    if steps is None:
+        majors = []
+        minors = []
+    else:
+        i0, i1 = steps
+        dx2 = 2 * dx
+        dy2 = 2 * dy
+        majors = list(range(x1 + sx * i0, x1 + sx * i1, sx))
+        minors = [y1 + sy * ((dy2 * i + dx) // dx2) for i in range(i0, i1)]
+
+    if steep:
+        xs, ys = minors, majors
+        width, height = height, width
+    else:
+        xs, ys = majors, minors
+
+    if 0 <= x2 and x2 < width and 0 <= y2 and y2 < height:
+        xs.append(x2)
+        ys.append(y2)
+
+    return xs, ys
+
+
+def _clip_line(
+    x1: int, y1: int, dx: int, dy: int, sx: int, sy: int, width: int, height: int
+) -> tuple | None:
+    """Clips line to range of visible steps along its major axis
+
+    Clipping is evaluated on steps of rasterized line, so the visible part
+    consists of exactly the same pixels as unclipped line would have.
+
+    :return:    First and past the last visible step or `None` when no step is visible
+    """
+    # Major axis coordinate is x1 + sx * i
+    if sx > 0:
+        i0 = max(0, -x1)
+        i1 = min(dx, width - x1)
+    else:
+        i0 = max(0, x1 - width + 1)
+        i1 = min(dx, x1 + 1)
+
+    # Minor axis coordinate is y1 + sy * m, where m = (2 * dy * i + dx) // (2 * dx)
+    # is nondecreasing, so visible m in <lo, hi> maps to continuous range of i.
+    if sy > 0:
+        lo = -y1
+        hi = height - 1 - y1
+    else:
+        lo = y1 - height + 1
+        hi = y1
+
+    if dy:
+        dx2 = 2 * dx
+        dy2 = 2 * dy
+        i0 = max(i0, -((dx - dx2 * lo) // dy2))
+        i1 = min(i1, -((dx - dx2 * (hi + 1)) // dy2))
+    elif lo > 0 or hi < 0:
+        return None
+
+    return (i0, i1) if i0 < i1 else None
+
+
+__all__ = ("bresenham_points",)
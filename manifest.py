@@ -0,0 +1,10 @@
+# Freezes drivers into MicroPython firmware, so byte code and constant
+# resources (e.g. LUT tables) are kept in flash instead of RAM.
+#
+# Usage (from MicroPython port directory):
+#   make BOARD=... FROZEN_MANIFEST=/path/to/ueink/manifest.py
+include("$(PORT_DIR)/boards/manifest.py")
+
+package("ueink", opt=3)
+package("upycompat", opt=3)
+module("__future__.py", base_path="mpy_root", opt=3)
@@ -9,10 +9,11 @@ epd = Epd()
 epd.transposed = True
 fb = epd.fb
 fb.rect(10, 10, 50, 100, 0, True)
-raw = epd.raw
+
+with open("out.bin", "wb") as f:
+    epd.flush_raw_to(f)
 
 __all__ = (
     "epd",
     "fb",
-    "raw",
 )
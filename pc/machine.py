@@ -1,9 +1,13 @@
 from __future__ import annotations
 
+from time import sleep
+
 
 class Pin:
     OUT = 12
     IN = 21
+    IRQ_FALLING = 2
+    IRQ_RISING = 1
 
     def __init__(self, *args, **kw) -> None:
         ...
@@ -17,6 +21,9 @@ class Pin:
     def value(self, v=None) -> None:
         return 1
 
+    def irq(self, *args, **kw) -> None:
+        ...
+
 
 class SPI:
     def __init__(self, *args, **kw) -> None:
@@ -29,7 +36,12 @@ class SPI:
         ...
 
 
+def idle() -> None:
+    sleep(0.001)
+
+
 __all__ = (
     "Pin",
     "SPI",
+    "idle",
 )
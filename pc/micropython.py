@@ -1,10 +1,23 @@
 from __future__ import annotations
 
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
 
 def native(fn) -> None:
     return fn
 
 
+def viper(fn) -> None:
+    # Viper functions work just on integers and buffers, so when numba is installed,
+    # they are compiled to native code the same way as on MicroPython
+    if njit is None:
+        return fn
+    return njit(cache=True, boundscheck=False)(fn)
+
+
 def const(v) -> None:
     return v
 
@@ -12,4 +25,5 @@ def const(v) -> None:
 __all__ = (
     "const",
     "native",
+    "viper",
 )
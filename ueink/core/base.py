@@ -30,14 +30,42 @@ from .logging import logger
 from .transform import Transform1B, Transform2B
 
 from framebuf import FrameBuffer, GS4_HMSB
-from gc import collect
-from io import BytesIO
-from time import sleep
+from sys import implementation
+from time import sleep, time
+from upycompat import micropython
 from upycompat.abc import (
     ABC,
     abstractmethod,
 )
 
+try:
+    from machine import idle
+except ImportError:
+
+    def idle() -> None:
+        # Just yields CPU when running on PC as RAW generator
+        sleep(0)
+
+
+if implementation.name == "micropython":
+    from gc import collect
+else:
+
+    def collect() -> None:
+        # CPython frees memory by reference counting and its heap does not
+        # fragment the way MicroPython one does, so full collection is not needed
+        pass
+
+
+try:
+    from deflate import DeflateIO
+except ImportError:
+    DeflateIO = None  # Deflate module is available since Micropython 1.21.0
+
+
+# Block size used for reading of compressed RAW data, which matches zlib block size
+_DEFLATE_BLK_SIZE = 16384
+
 
 class IEpd(ABC):
     """Base interface for EPD drivers
@@ -52,6 +80,9 @@ class IEpd(ABC):
     :param dc:     Data/Command pin of EInk display (relevant only when `spi` is not `None`)
     :param rst:    Reset pin of EInk display (relevant only when `spi` is not `None`)
     :param busy:   Busy signalization pin of EInk display (relevant only when `spi` is not `None`)
+    :param spi_hz: SPI clock frequency (relevant only when `spi` is not `None`). Controllers of
+                   supported displays work with 10MHz clock, it can be lowered (e.g. to 2MHz)
+                   when display is connected through long wires.
     """
 
     def __init__(
@@ -63,15 +94,17 @@ class IEpd(ABC):
         dc: "machine.Pin" | None = None,
         rst: "machine.Pin" | None = None,
         busy: "machine.Pin" | None = None,
+        spi_hz: int = 10000000,
     ) -> None:
         self._spi = spi
 
         if spi is not None:
             self._spi.init(
-                baudrate=2000000,
+                baudrate=spi_hz,
                 polarity=0,
                 phase=0,
             )
+            self._spi_write = spi.write
             logger.info("\tSPI - [ OK ]")
 
             self._cs = cs
@@ -84,6 +117,7 @@ class IEpd(ABC):
 
             if dc:
                 self._dc.init(self._dc.OUT, value=0)
+                self._dc_value = self._dc.value
 
             if rst:
                 self._rst = NCSPin(rst)
@@ -91,6 +125,12 @@ class IEpd(ABC):
             if busy:
                 self._busy.init(self._busy.IN)
 
+                # Edges of busy pin wake up CPU waiting in _wait4ready
+                self._busy.irq(
+                    handler=_busy_irq,
+                    trigger=self._busy.IRQ_RISING | self._busy.IRQ_FALLING,
+                )
+
             logger.info("\tPins - [ OK ]")
         else:
             logger.info("\tSPI - [ unused ]")
@@ -99,7 +139,10 @@ class IEpd(ABC):
         self._buf = None
         self._tran = False
 
-        self._blk_size = 1024
+        self._blk_size = 4096
+        self._blk_size_set = False
+        self._cmdbuf = bytearray(1)
+        self._segm = None
 
         self.width = self._w
         self.height = self._h
@@ -119,6 +162,13 @@ class IEpd(ABC):
         """
         ...
 
+    @abstractmethod
+    def _fb2raw_to(self, write: "function") -> None:
+        """Interface method for building of display RAW data from frame buffer block by block
+        :param write:    Function called with each converted block of RAW data
+        """
+        ...
+
     # ###################
     # ###  Properties ###
     # ###################
@@ -145,18 +195,35 @@ class IEpd(ABC):
         self._mkfb()
         return self._fb2raw()
 
+    def flush_raw_to(self, f: "uio.FileIO" | "uio.BytesIO") -> None:
+        """Writes frame buffer converted to display native RAW format to stream
+
+        This is the same data as `raw` provides, but it is converted block by block
+        (see `copy_block_size`) and each block is written to stream as soon as it is
+        converted, so no RAW copy of whole frame is allocated. Stored file can be
+        later passed to `flush`.
+
+        :param f:    Stream as destination of RAW data.
+        """
+        self._mkfb()
+        self._fb2raw_to(f.write)
+
     @property
     def copy_block_size(self) -> int:
         """Gets/sets block size used for RAW copy of data to display
 
-        This size is 1KB by default. It can be increased to make data transfer slightly faster
-        or decreased to save a bit more RAM.
+        This size is 4KB by default. It can be increased to make data transfer slightly faster
+        or decreased to save a bit more RAM. Compressed RAW data read through `deflate.DeflateIO`
+        are copied by 16KB blocks to match zlib block size, unless block size is set explicitly.
         """
         return self._blk_size
 
     @copy_block_size.setter
     def copy_block_size(self, value: int) -> None:
         self._blk_size = value
+        self._blk_size_set = True
+        self._segm = None
+        collect()
 
     @property
     def transposed(self) -> bool:
@@ -192,7 +259,8 @@ class IEpd(ABC):
         `deflate.DeflateIO`).
 
         When stream argument is omitted (or is set to `None`), then internal frame
-        buffer is used.
+        buffer is used. It is converted to RAW data block by block (see
+        `copy_block_size`) while flushing, so no RAW copy of whole frame is allocated.
 
         :param stream:    Stream as source of RAW data.
         """
@@ -204,9 +272,18 @@ class IEpd(ABC):
                 raise RuntimeError(
                     "Frame buffer was not created (property Eink.fb was not read)"
                 )
-            stream = BytesIO(self._fb2raw())
-
-        self._flush_raw(stream)
+            self._flush_fb()
+        elif DeflateIO is not None and isinstance(stream, DeflateIO):
+            if self._blk_size_set:
+                self._flush_raw(stream, self._blk_size)
+            else:
+                self._flush_raw(stream, _DEFLATE_BLK_SIZE)
+
+                # Segment larger than copy block size is not kept between flushes
+                self._segm = None
+                collect()
+        else:
+            self._flush_raw(stream, self._blk_size)
 
     # ###################
     # ###  Decorators ###
@@ -226,9 +303,17 @@ class IEpd(ABC):
 
         def decorator(cls: type) -> type:
             cls.color = colors
+            cls._fill_white = colors["white"]
             cls._w = width
             cls._h = height
             cls._fb_len = (width * height + 1) // 2
+
+            # Constant command payloads derived from display resolution
+            h_le = bytes(((height - 1) & 0xFF, (height - 1) >> 8))
+            cls._wh_be = bytes((width >> 8, width & 0xFF, height >> 8, height & 0xFF))
+            cls._x_win = bytes((0, (width - 1) >> 3))
+            cls._y_win = h_le + b"\x00\x00"
+            cls._y_start = h_le
             return cls
 
         return decorator
@@ -239,7 +324,9 @@ class IEpd(ABC):
         cls._init = DrvWaveShareBw._init
         cls._flush = DrvWaveShareBw._flush
         cls._flush_raw_buffers = Transform1B._flush_raw_buffers
+        cls._flush_fb_buffers = Transform1B._flush_fb_buffers
         cls._fb2raw = Transform1B._fb2raw
+        cls._fb2raw_to = Transform1B._fb2raw_to
         return cls
 
     @staticmethod
@@ -250,6 +337,10 @@ class IEpd(ABC):
         cls._flush_raw_buffers = Transform2B._flush_raw_buffers
         cls._fb2raw_com = Transform2B._fb2raw_com
         cls._fb2raw = Transform2B._fb2raw_3c
+        cls._fb2raw_to_com = Transform2B._fb2raw_to_com
+        cls._fb2raw_to = Transform2B._fb2raw_to_3c
+        cls._flush_fb_buffers_com = Transform2B._flush_fb_buffers_com
+        cls._flush_fb_buffers = Transform2B._flush_fb_buffers_3c
         return cls
 
     @staticmethod
@@ -260,11 +351,16 @@ class IEpd(ABC):
         cls._flush_raw_buffers = Transform2B._flush_raw_buffers
         cls._fb2raw_com = Transform2B._fb2raw_com
         cls._fb2raw = Transform2B._fb2raw_gs
+        cls._fb2raw_to_com = Transform2B._fb2raw_to_com
+        cls._fb2raw_to = Transform2B._fb2raw_to_gs
+        cls._flush_fb_buffers_com = Transform2B._flush_fb_buffers_com
+        cls._flush_fb_buffers = Transform2B._flush_fb_buffers_gs
         return cls
 
     # #################################
     # ###  Internal helpers methods ###
     # #################################
+    @micropython.native
     def _mkfb(self) -> None:
         if self._fb is None:
             self._renewfb()
@@ -276,34 +372,69 @@ class IEpd(ABC):
         if self._buf is None:
             self._buf = bytearray(l)
         self._fb = FrameBuffer(self._buf, self.width, self.height, GS4_HMSB)
-        self._fb.fill(self.color["white"])
+        self._fb.fill(self._fill_white)
 
+    def _get_segm(self, n: int) -> memoryview:
+        # Segment buffer is kept between flushes and grown on demand
+        if self._segm is None or len(self._segm) < n:
+            self._segm = None
+            collect()
+            self._segm = memoryview(bytearray(n))
+        return self._segm[:n]
+
+    @micropython.native
     def _cmd(self, command, data=None) -> None:
-        self._dc(0)
-        with self._cs:
-            self._spi.write(bytearray([command]))
+        # Command and its data are sent within single chip select
+        cmdbuf = self._cmdbuf
+        cmdbuf[0] = command
+        cs = self._cs
+        dc = self._dc_value
+        write = self._spi_write
+        cs.assert_()
+        dc(0)
+        write(cmdbuf)
         if data is not None:
-            self._data(data)
+            dc(1)
+            write(data)
+        cs.deassert()
 
+    @micropython.native
     def _data(self, data) -> None:
-        self._dc(1)
-        with self._cs:
-            self._spi.write(data)
+        cs = self._cs
+        self._dc_value(1)
+        cs.assert_()
+        self._spi_write(data)
+        cs.deassert()
 
+    @micropython.native
     def _wait4ready(self, busy: bool, timeout: int = 10) -> None:
         rdy = int(not busy)
-        for _ in range(timeout * 100):
-            if rdy == self._busy.value():
-                return
-            sleep(0.01)
+        value = self._busy.value
+        deadline = time() + timeout
 
-        raise RuntimeError("EPD Timeout")
+        # CPU idles until next interrupt, which is either edge of busy pin
+        # or system tick, so ready state is detected without polling delay
+        while rdy != value():
+            if time() > deadline:
+                raise RuntimeError("EPD Timeout")
+            idle()
 
-    def _flush_raw(self, stream: "uio.FileIO" | "uio.BytesIO") -> None:
+    def _flush_raw(self, stream: "uio.FileIO" | "uio.BytesIO", blk_size: int) -> None:
         logger.info("Display frame:")
         self._init()
-        self._flush_raw_buffers(stream)
+        self._flush_raw_buffers(stream, blk_size)
         self._flush()
 
+    def _flush_fb(self) -> None:
+        logger.info("Display frame:")
+        self._init()
+        self._flush_fb_buffers()
+        self._flush()
+
+
+def _busy_irq(pin: "machine.Pin") -> None:
+    # Nothing to do, interrupt itself wakes up waiting CPU
+    pass
+
 
 __all__ = ("IEpd",)
@@ -33,7 +33,6 @@ from .resources import (
     EPD_GS4_LUT_W2W,
 )
 
-from struct import pack
 from time import sleep
 
 
@@ -48,7 +47,7 @@ class DrvDespiC02:
         self._cmd(0x01, b"\x07\x07\x3F\x3F\x00")
         self._cmd(0x06, b"\x17\x17\x28\x17")
         self._cmd(0x00, b"\x3F")
-        self._cmd(0x61, pack(">HH", self._w, self._h))
+        self._cmd(0x61, self._wh_be)
         self._cmd(0x15, b"\x00")
         self._cmd(0x82, b"\x30")
         self._cmd(0x50, b"\x29\x07")
@@ -71,11 +70,11 @@ class DrvDespiC02:
         self._wait4ready(False)
 
         logger.info("\tPower off screen screen ...")
-        self._cmd(0x50, b"0xF7")
+        self._cmd(0x50, b"\xF7")
         self._cmd(0x02)
         self._wait4ready(False)
         sleep(0.1)
-        self._cmd(0x07, b"0xA5")
+        self._cmd(0x07, b"\xA5")
 
 
 __all__ = ("DrvDespiC02",)
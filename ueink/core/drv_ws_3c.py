@@ -26,7 +26,6 @@ from __future__ import annotations
 
 from .logging import logger
 
-from struct import pack
 from time import sleep
 
 
@@ -40,7 +39,7 @@ class DrvWaveShare3Color:
 
         self._cmd(0x06, b"\x17\x17\x17")
         self._cmd(0x00, b"\x0F")
-        self._cmd(0x61, pack(">HH", self._w, self._h))
+        self._cmd(0x61, self._wh_be)
         self._cmd(0x50, b"\xF7")
         self._cmd(0x04)
         self._wait4ready(False)
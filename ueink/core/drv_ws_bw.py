@@ -27,10 +27,17 @@ from __future__ import annotations
 from .logging import logger
 from .resources import EPD_WS_BW
 
-from struct import pack
 from time import sleep
 
 
+# Waveform LUT and its voltage settings sent to display by separate commands
+_LUT = memoryview(EPD_WS_BW)
+_LUT_EOPT = _LUT[153:154]
+_LUT_VGH = _LUT[154:155]
+_LUT_VSH = _LUT[155:158]
+_LUT_VCOM = _LUT[158:159]
+
+
 class DrvWaveShareBw:
     def _init(self) -> None:
         logger.info("\tInit ...")
@@ -46,25 +53,23 @@ class DrvWaveShareBw:
 
         self._cmd(0x01, b"\xC7\x00\x01")
         self._cmd(0x11, b"\x01")
-        self._cmd(0x44, pack("<bb", 0, (self._w - 1) >> 3))
-        self._cmd(0x45, pack("<HH", (self._h - 1), 0))
+        self._cmd(0x44, self._x_win)
+        self._cmd(0x45, self._y_win)
         self._cmd(0x3C, b"\x01")
         self._cmd(0x18, b"\x80")
         self._cmd(0x22, b"\xB1")
         self._cmd(0x20)
         self._cmd(0x4E, b"\x00")
-        self._cmd(0x4F, pack("<H", (self._h - 1)))
+        self._cmd(0x4F, self._y_start)
         self._wait4ready(True)
 
-        lut = memoryview(EPD_WS_BW)
-
-        self._cmd(0x32, lut)
+        self._cmd(0x32, _LUT)
         self._wait4ready(True)
 
-        self._cmd(0x3F, lut[153:154])
-        self._cmd(0x03, lut[154:155])
-        self._cmd(0x04, lut[155:158])
-        self._cmd(0x2C, lut[158:159])
+        self._cmd(0x3F, _LUT_EOPT)
+        self._cmd(0x03, _LUT_VGH)
+        self._cmd(0x04, _LUT_VSH)
+        self._cmd(0x2C, _LUT_VCOM)
 
     def _flush(self) -> None:
         logger.info("\tPower on screen screen ...")
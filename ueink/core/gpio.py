@@ -20,11 +20,9 @@
 # SOFTWARE.
 from __future__ import annotations
 
-from machine import Pin
-
 
 class NCSPin:
-    def __init__(self, pin: Pin) -> None:
+    def __init__(self, pin: "machine.Pin") -> None:
         pin.init(pin.OUT, value=True)
         self._pin = pin
 
@@ -35,9 +33,15 @@ class NCSPin:
     def __exit__(self, exc_type, exc_val, exc_tb) -> None:
         self._pin(True)
 
+    def assert_(self) -> None:
+        self._pin(False)
+
+    def deassert(self) -> None:
+        self._pin(True)
+
 
 class CSPin:
-    def __init__(self, pin: Pin) -> None:
+    def __init__(self, pin: "machine.Pin") -> None:
         pin.init(pin.OUT, value=False)
         self._pin = pin
 
@@ -48,6 +52,12 @@ class CSPin:
     def __exit__(self, exc_type, exc_val, exc_tb) -> None:
         self._pin(False)
 
+    def assert_(self) -> None:
+        self._pin(True)
+
+    def deassert(self) -> None:
+        self._pin(False)
+
 
 __all__ = (
     "CSPin",
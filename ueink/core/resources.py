@@ -83,7 +83,91 @@ EPD_WS_BW = (
     b"\x22\x22\x22\x00\x00\x00\x22\x17\x41\x00\x32\x20"
 )
 
+# GS4 pixel pair to 2 bits of RAW buffer 1 (black & white)
+EPD_GS4_LUT_BUF1 = (
+    b"\x00\x00\x00\x00\x00\x00\x00\x00\x01\x01\x01\x01\x01\x01\x01\x01"  # 0x00 .. 0x0F
+    b"\x00\x00\x00\x00\x00\x00\x00\x00\x01\x01\x01\x01\x01\x01\x01\x01"  # 0x10 .. 0x1F
+    b"\x00\x00\x00\x00\x00\x00\x00\x00\x01\x01\x01\x01\x01\x01\x01\x01"  # 0x20 .. 0x2F
+    b"\x00\x00\x00\x00\x00\x00\x00\x00\x01\x01\x01\x01\x01\x01\x01\x01"  # 0x30 .. 0x3F
+    b"\x00\x00\x00\x00\x00\x00\x00\x00\x01\x01\x01\x01\x01\x01\x01\x01"  # 0x40 .. 0x4F
+    b"\x00\x00\x00\x00\x00\x00\x00\x00\x01\x01\x01\x01\x01\x01\x01\x01"  # 0x50 .. 0x5F
+    b"\x00\x00\x00\x00\x00\x00\x00\x00\x01\x01\x01\x01\x01\x01\x01\x01"  # 0x60 .. 0x6F
+    b"\x00\x00\x00\x00\x00\x00\x00\x00\x01\x01\x01\x01\x01\x01\x01\x01"  # 0x70 .. 0x7F
+    b"\x02\x02\x02\x02\x02\x02\x02\x02\x03\x03\x03\x03\x03\x03\x03\x03"  # 0x80 .. 0x8F
+    b"\x02\x02\x02\x02\x02\x02\x02\x02\x03\x03\x03\x03\x03\x03\x03\x03"  # 0x90 .. 0x9F
+    b"\x02\x02\x02\x02\x02\x02\x02\x02\x03\x03\x03\x03\x03\x03\x03\x03"  # 0xA0 .. 0xAF
+    b"\x02\x02\x02\x02\x02\x02\x02\x02\x03\x03\x03\x03\x03\x03\x03\x03"  # 0xB0 .. 0xBF
+    b"\x02\x02\x02\x02\x02\x02\x02\x02\x03\x03\x03\x03\x03\x03\x03\x03"  # 0xC0 .. 0xCF
+    b"\x02\x02\x02\x02\x02\x02\x02\x02\x03\x03\x03\x03\x03\x03\x03\x03"  # 0xD0 .. 0xDF
+    b"\x02\x02\x02\x02\x02\x02\x02\x02\x03\x03\x03\x03\x03\x03\x03\x03"  # 0xE0 .. 0xEF
+    b"\x02\x02\x02\x02\x02\x02\x02\x02\x03\x03\x03\x03\x03\x03\x03\x03"  # 0xF0 .. 0xFF
+)
+
+# GS4 pixel pair to 2 bits of RAW buffer 2 (gray levels)
+EPD_GS4_LUT_BUF2 = (
+    b"\x00\x00\x00\x00\x01\x01\x01\x01\x00\x00\x00\x00\x01\x01\x01\x01"  # 0x00 .. 0x0F
+    b"\x00\x00\x00\x00\x01\x01\x01\x01\x00\x00\x00\x00\x01\x01\x01\x01"  # 0x10 .. 0x1F
+    b"\x00\x00\x00\x00\x01\x01\x01\x01\x00\x00\x00\x00\x01\x01\x01\x01"  # 0x20 .. 0x2F
+    b"\x00\x00\x00\x00\x01\x01\x01\x01\x00\x00\x00\x00\x01\x01\x01\x01"  # 0x30 .. 0x3F
+    b"\x02\x02\x02\x02\x03\x03\x03\x03\x02\x02\x02\x02\x03\x03\x03\x03"  # 0x40 .. 0x4F
+    b"\x02\x02\x02\x02\x03\x03\x03\x03\x02\x02\x02\x02\x03\x03\x03\x03"  # 0x50 .. 0x5F
+    b"\x02\x02\x02\x02\x03\x03\x03\x03\x02\x02\x02\x02\x03\x03\x03\x03"  # 0x60 .. 0x6F
+    b"\x02\x02\x02\x02\x03\x03\x03\x03\x02\x02\x02\x02\x03\x03\x03\x03"  # 0x70 .. 0x7F
+    b"\x00\x00\x00\x00\x01\x01\x01\x01\x00\x00\x00\x00\x01\x01\x01\x01"  # 0x80 .. 0x8F
+    b"\x00\x00\x00\x00\x01\x01\x01\x01\x00\x00\x00\x00\x01\x01\x01\x01"  # 0x90 .. 0x9F
+    b"\x00\x00\x00\x00\x01\x01\x01\x01\x00\x00\x00\x00\x01\x01\x01\x01"  # 0xA0 .. 0xAF
+    b"\x00\x00\x00\x00\x01\x01\x01\x01\x00\x00\x00\x00\x01\x01\x01\x01"  # 0xB0 .. 0xBF
+    b"\x02\x02\x02\x02\x03\x03\x03\x03\x02\x02\x02\x02\x03\x03\x03\x03"  # 0xC0 .. 0xCF
+    b"\x02\x02\x02\x02\x03\x03\x03\x03\x02\x02\x02\x02\x03\x03\x03\x03"  # 0xD0 .. 0xDF
+    b"\x02\x02\x02\x02\x03\x03\x03\x03\x02\x02\x02\x02\x03\x03\x03\x03"  # 0xE0 .. 0xEF
+    b"\x02\x02\x02\x02\x03\x03\x03\x03\x02\x02\x02\x02\x03\x03\x03\x03"  # 0xF0 .. 0xFF
+)
+
+# GS4 pixel pair to 2 bits of RAW buffer 1 of 3-color display
+EPD_3C_LUT_BUF1 = (
+    b"\x00\x01\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00"  # 0x00 .. 0x0F
+    b"\x02\x03\x02\x02\x02\x02\x02\x02\x02\x02\x02\x02\x02\x02\x02\x02"  # 0x10 .. 0x1F
+    b"\x00\x01\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00"  # 0x20 .. 0x2F
+    b"\x00\x01\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00"  # 0x30 .. 0x3F
+    b"\x00\x01\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00"  # 0x40 .. 0x4F
+    b"\x00\x01\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00"  # 0x50 .. 0x5F
+    b"\x00\x01\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00"  # 0x60 .. 0x6F
+    b"\x00\x01\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00"  # 0x70 .. 0x7F
+    b"\x00\x01\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00"  # 0x80 .. 0x8F
+    b"\x00\x01\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00"  # 0x90 .. 0x9F
+    b"\x00\x01\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00"  # 0xA0 .. 0xAF
+    b"\x00\x01\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00"  # 0xB0 .. 0xBF
+    b"\x00\x01\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00"  # 0xC0 .. 0xCF
+    b"\x00\x01\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00"  # 0xD0 .. 0xDF
+    b"\x00\x01\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00"  # 0xE0 .. 0xEF
+    b"\x00\x01\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00"  # 0xF0 .. 0xFF
+)
+
+# GS4 pixel pair to 2 bits of RAW buffer 2 of 3-color display
+EPD_3C_LUT_BUF2 = (
+    b"\x03\x03\x02\x02\x02\x02\x02\x02\x02\x02\x02\x02\x02\x02\x02\x02"  # 0x00 .. 0x0F
+    b"\x03\x03\x02\x02\x02\x02\x02\x02\x02\x02\x02\x02\x02\x02\x02\x02"  # 0x10 .. 0x1F
+    b"\x01\x01\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00"  # 0x20 .. 0x2F
+    b"\x01\x01\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00"  # 0x30 .. 0x3F
+    b"\x01\x01\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00"  # 0x40 .. 0x4F
+    b"\x01\x01\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00"  # 0x50 .. 0x5F
+    b"\x01\x01\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00"  # 0x60 .. 0x6F
+    b"\x01\x01\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00"  # 0x70 .. 0x7F
+    b"\x01\x01\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00"  # 0x80 .. 0x8F
+    b"\x01\x01\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00"  # 0x90 .. 0x9F
+    b"\x01\x01\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00"  # 0xA0 .. 0xAF
+    b"\x01\x01\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00"  # 0xB0 .. 0xBF
+    b"\x01\x01\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00"  # 0xC0 .. 0xCF
+    b"\x01\x01\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00"  # 0xD0 .. 0xDF
+    b"\x01\x01\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00"  # 0xE0 .. 0xEF
+    b"\x01\x01\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00"  # 0xF0 .. 0xFF
+)
+
 __all__ = (
+    "EPD_3C_LUT_BUF1",
+    "EPD_3C_LUT_BUF2",
+    "EPD_GS4_LUT_BUF1",
+    "EPD_GS4_LUT_BUF2",
     "EPD_GS4_LUT_K2K",
     "EPD_GS4_LUT_K2W",
     "EPD_GS4_LUT_VCOM",
@@ -23,97 +23,229 @@
 from __future__ import annotations
 
 from .logging import logger
+from .resources import (
+    EPD_3C_LUT_BUF1,
+    EPD_3C_LUT_BUF2,
+    EPD_GS4_LUT_BUF1,
+    EPD_GS4_LUT_BUF2,
+)
 
-from framebuf import FrameBuffer, MONO_HLSB
+from upycompat import micropython
 
 
 class Transform1B:
     def _fb2raw(self) -> bytearray:
         raw_buf = bytearray(self._fb_len // 4)
+        _fb2raw_plane(self, memoryview(raw_buf), EPD_GS4_LUT_BUF1, _transpose_1b)
+        return raw_buf
 
-        if self._tran:
-            # Transposing display orientation. Pixel by pixel - slow method
-            px_i = self._fb.pixel
-            px_o = FrameBuffer(raw_buf, self.height, self.width, MONO_HLSB).pixel
-            r = self.height - 1
+    def _fb2raw_to(self, write: "function") -> None:
+        _flush_fb_plane(self, EPD_GS4_LUT_BUF1, _transpose_1b, write)
 
-            for y in range(self.width):
-                for x in range(self.height):
-                    px_o(x, y, px_i(y, r - x) >> 3)
-        else:
-            # Use of built-in blit conversion (native display orientation)
-            fb = FrameBuffer(raw_buf, self.width, self.height, MONO_HLSB)
-            pal = FrameBuffer(bytearray(b"\x00\xFF"), 16, 1, MONO_HLSB)
-            fb.blit(self._fb, 0, 0, -1, pal)
-
-        return raw_buf
+    def _flush_fb_buffers(self) -> None:
+        logger.info(f"\tWrite RAW buffer ({self._fb_len // 4} bytes) ...")
+        self._cmd(0x24)
+        _flush_fb_plane(self, EPD_GS4_LUT_BUF1, _transpose_1b, self._data)
 
-    def _flush_raw_buffers(self, stream: "uio.FileIO" | "uio.BytesIO") -> None:
+    @micropython.native
+    def _flush_raw_buffers(
+        self, stream: "uio.FileIO" | "uio.BytesIO", blk_size: int
+    ) -> None:
         buf_len = self._fb_len // 4
         logger.info(f"\tWrite RAW buffer ({buf_len} bytes) ...")
-        segm_len = min(buf_len, self._blk_size)
-        segm = memoryview(bytearray(segm_len))
+        segm_len = min(buf_len, blk_size)
+        segm = self._get_segm(segm_len)
+
+        data = self._data
+        readinto = stream.readinto
 
         self._cmd(0x24)
-        cnt = stream.readinto(segm)
+        cnt = readinto(segm)
         while cnt:
-            self._data(segm[:cnt])
-            cnt = stream.readinto(segm)
+            data(segm[:cnt])
+            cnt = readinto(segm)
 
 
 class Transform2B:
     def _fb2raw_gs(self) -> bytearray:
-        return self._fb2raw_com(b"\x00\xFF", b"\x0F\x0F")
+        return self._fb2raw_com(EPD_GS4_LUT_BUF1, EPD_GS4_LUT_BUF2)
 
     def _fb2raw_3c(self) -> bytearray:
-        return self._fb2raw_com(b"@\x00", b"\xC0\x00")
+        return self._fb2raw_com(EPD_3C_LUT_BUF1, EPD_3C_LUT_BUF2)
 
-    def _fb2raw_com(self, pal1: bytes, pal2: bytes) -> bytearray:
+    def _fb2raw_com(self, lut1: bytes, lut2: bytes) -> bytearray:
         raw_buf = memoryview(bytearray(self._fb_len // 2))
         buf_len = self._fb_len // 4
-        pal1 = FrameBuffer(bytearray(pal1), 16, 1, MONO_HLSB)
-        pal2 = FrameBuffer(bytearray(pal2), 16, 1, MONO_HLSB)
-
-        if self._tran:
-            # Transposing display orientation. Pixel by pixel - slow method
-            px_i = self._fb.pixel
-            px_o1 = FrameBuffer(raw_buf[:buf_len], self._w, self._h, MONO_HLSB).pixel
-            px_o2 = FrameBuffer(raw_buf[buf_len:], self._w, self._h, MONO_HLSB).pixel
-            r = self._h - 1
-
-            pal1 = pal1.pixel
-            pal2 = pal2.pixel
-            for y in range(self._h):
-                for x in range(self._w):
-                    p = px_i(r - y, x)
-                    px_o1(x, y, pal1(p, 0))
-                    px_o2(x, y, pal2(p, 0))
-        else:
-            # Direct frame buffer conversion (native display orientation)
-            fb = FrameBuffer(raw_buf[:buf_len], self.width, self.height, MONO_HLSB)
-            fb.blit(self._fb, 0, 0, -1, pal1)
+        _fb2raw_plane(self, raw_buf[:buf_len], lut1, _transpose_2b)
+        _fb2raw_plane(self, raw_buf[buf_len:], lut2, _transpose_2b)
+        return raw_buf
 
-            fb = FrameBuffer(raw_buf[buf_len:], self.width, self.height, MONO_HLSB)
-            fb.blit(self._fb, 0, 0, -1, pal2)
+    def _fb2raw_to_gs(self, write: "function") -> None:
+        self._fb2raw_to_com(EPD_GS4_LUT_BUF1, EPD_GS4_LUT_BUF2, write)
 
-        return raw_buf
+    def _fb2raw_to_3c(self, write: "function") -> None:
+        self._fb2raw_to_com(EPD_3C_LUT_BUF1, EPD_3C_LUT_BUF2, write)
 
-    def _flush_raw_buffers(self, stream: "uio.FileIO" | "uio.BytesIO") -> None:
+    def _fb2raw_to_com(self, lut1: bytes, lut2: bytes, write: "function") -> None:
+        _flush_fb_plane(self, lut1, _transpose_2b, write)
+        _flush_fb_plane(self, lut2, _transpose_2b, write)
+
+    def _flush_fb_buffers_gs(self) -> None:
+        self._flush_fb_buffers_com(EPD_GS4_LUT_BUF1, EPD_GS4_LUT_BUF2)
+
+    def _flush_fb_buffers_3c(self) -> None:
+        self._flush_fb_buffers_com(EPD_3C_LUT_BUF1, EPD_3C_LUT_BUF2)
+
+    def _flush_fb_buffers_com(self, lut1: bytes, lut2: bytes) -> None:
+        logger.info("\tWrite RAW buffer 1 ...")
+        self._cmd(0x10)
+        _flush_fb_plane(self, lut1, _transpose_2b, self._data)
+
+        logger.info("\tWrite RAW buffer 2 ...")
+        self._cmd(0x13)
+        _flush_fb_plane(self, lut2, _transpose_2b, self._data)
+
+    @micropython.native
+    def _flush_raw_buffers(
+        self, stream: "uio.FileIO" | "uio.BytesIO", blk_size: int
+    ) -> None:
         logger.info("\tWrite RAW buffer 1 ...")
         buf_len = self._fb_len // 4
-        segm_len = min(buf_len, self._blk_size)
-        segm = memoryview(bytearray(segm_len))
+        segm_len = min(buf_len, blk_size)
+        segm = self._get_segm(segm_len)
+        full = buf_len // segm_len
+        tail = segm[: buf_len - full * segm_len]
 
         self._cmd(0x10)
-        for i in range(0, buf_len, segm_len):
-            cnt = stream.readinto(segm[: min(segm_len, buf_len - i)])
-            self._data(segm[:cnt])
+        _copy_plane(self, stream, segm, full, tail)
 
         logger.info("\tWrite RAW buffer 2 ...")
         self._cmd(0x13)
-        for i in range(0, buf_len, segm_len):
-            cnt = stream.readinto(segm[: min(segm_len, buf_len - i)])
-            self._data(segm[:cnt])
+        _copy_plane(self, stream, segm, full, tail)
+
+
+@micropython.native
+def _copy_plane(
+    epd: "IEpd",
+    stream: "uio.FileIO" | "uio.BytesIO",
+    segm: memoryview,
+    full: int,
+    tail: memoryview,
+) -> None:
+    # Copies RAW plane from stream to display by full segments followed by
+    # shorter tail segment, so only the plane is read from stream
+    data = epd._data
+    readinto = stream.readinto
+
+    for _ in range(full):
+        cnt = readinto(segm)
+        data(segm[:cnt])
+
+    if tail:
+        cnt = readinto(tail)
+        data(tail[:cnt])
+
+
+def _flush_fb_plane(
+    epd: "IEpd", lut: bytes, transpose: "function", write: "function"
+) -> None:
+    # Converts RAW plane segment by segment, each segment is passed to write
+    # (display or file) as soon as it is converted, so whole RAW plane is never
+    # allocated
+    buf_len = epd._fb_len // 4
+    row_len = epd._w >> 3
+    segm_len = min(buf_len, max(1, epd._blk_size // row_len) * row_len)
+    _fb2raw_plane(epd, epd._get_segm(segm_len), lut, transpose, write)
+
+
+@micropython.native
+def _fb2raw_plane(
+    epd: "IEpd",
+    segm: memoryview,
+    lut: bytes,
+    transpose: "function",
+    write: "function" | None = None,
+) -> None:
+    # Converts RAW plane through segm, which is passed to write after each
+    # conversion. When segm is as long as the plane, then it is converted at
+    # once. When display is transposed, segm length has to be aligned to RAW rows.
+    buf_len = epd._fb_len // 4
+    segm_len = len(segm)
+    src = memoryview(epd._buf)
+    tran = epd._tran
+    w = epd._w
+    h = epd._h
+    row_len = w >> 3
+
+    for i in range(0, buf_len, segm_len):
+        data = segm[: min(segm_len, buf_len - i)]
+
+        if tran:
+            transpose(src, data, lut, w, h, i // row_len, len(data) // row_len)
+        else:
+            # Native orientation is not converted by FrameBuffer.blit() through palette,
+            # as table of pixel pairs needs single load per two pixels, where blit needs
+            # pixel read, palette read and pixel write for each pixel. Packing also
+            # allows conversion of just a segment of RAW plane.
+            _pack(src[i * 4 :], data, lut, len(data))
+
+        if write is not None:
+            write(data)
+
+
+@micropython.viper
+def _pack(src: ptr8, dst: ptr8, lut: ptr8, n: int):
+    # Builds n bytes of MONO_HLSB RAW plane from GS4_HMSB frame buffer of the same
+    # orientation, each RAW byte is composed of 4 pixel pairs mapped by lut
+    s = 0
+    for d in range(n):
+        dst[d] = (
+            (lut[src[s]] << 6)
+            | (lut[src[s + 1]] << 4)
+            | (lut[src[s + 2]] << 2)
+            | lut[src[s + 3]]
+        )
+        s += 4
+
+
+@micropython.viper
+def _transpose_1b(src: ptr8, dst: ptr8, lut: ptr8, w: int, h: int, y: int, n: int):
+    # Builds n rows starting at row y of w x h MONO_HLSB RAW plane, where RAW pixel
+    # (x, y) is pixel (y, w - 1 - x) of transposed GS4_HMSB frame buffer (h pixels
+    # wide), mapped through lut. Each RAW byte is collected from 8 pixels and
+    # stored once.
+    advance = (h + 1) >> 1
+    o = 0
+    for y in range(y, y + n):
+        shift = ((y & 1) ^ 1) << 2
+        i = (w - 1) * advance + (y >> 1)
+        for _ in range(w >> 3):
+            v = 0
+            for _ in range(8):
+                v = (v << 1) | (lut[(src[i] >> shift) & 0x0F] & 1)
+                i -= advance
+            dst[o] = v
+            o += 1
+
+
+@micropython.viper
+def _transpose_2b(src: ptr8, dst: ptr8, lut: ptr8, w: int, h: int, y: int, n: int):
+    # Builds n rows starting at row y of w x h MONO_HLSB RAW plane, where RAW pixel
+    # (x, y) is pixel (h - 1 - y, x) of transposed GS4_HMSB frame buffer (h pixels
+    # wide), mapped through lut.
+    advance = (h + 1) >> 1
+    o = 0
+    for y in range(y, y + n):
+        r = h - 1 - y
+        shift = ((r & 1) ^ 1) << 2
+        i = r >> 1
+        for _ in range(w >> 3):
+            v = 0
+            for _ in range(8):
+                v = (v << 1) | (lut[(src[i] >> shift) & 0x0F] & 1)
+                i += advance
+            dst[o] = v
+            o += 1
 
 
 __all__ = (